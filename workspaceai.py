@@ -19,20 +19,23 @@ RESET = "\033[0m"
 import json
 import requests
 import re
+import fnmatch
 import sys
 import os
 import time
+import threading
 import platform
 from datetime import datetime
-import threading
 import shutil
 import logging
 import hashlib
 import zipfile
 import tarfile
-import subprocess
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Optional, List, Union, Dict, Any
 
 # Suppress HTTP library logging noise
@@ -41,6 +44,11 @@ logging.getLogger("urllib3").setLevel(logging.WARNING)
 logging.getLogger("httpx").setLevel(logging.WARNING)
 logging.getLogger("httpcore").setLevel(logging.WARNING)
 
+# Host OS doesn't change while running, so look it up once
+CURRENT_OS = platform.system()
+# Lower-case form used to key per-platform tables such as SOFTWARE_DB
+CURRENT_OS_KEY = CURRENT_OS.lower()
+
 CONSTANTS = {
     'API_TIMEOUT': 30,
     'API_MAX_RETRIES': 3,
@@ -50,7 +58,10 @@ CONSTANTS = {
     'MAX_SUMMARIZED_CONVERSATIONS': 20,
     'MAX_FILENAME_LENGTH': 255,
     'PROGRESS_DURATION': 2,
+    'PROGRESS_STEPS': 20,  # Redraws per progress bar (must divide 100)
+    'PROGRESS_DELAY': 0.3,  # Operations finishing sooner show no progress bar
     'SEARCH_MAX_FILE_KB': 1024,
+    'TOOL_CACHE_SIZE': 64,
     'VERSION': "3.0",
     'SYSTEM_PROMPT': """You are WorkspaceAI, an intelligent file management assistant with access to file operation tools in a secure workspace environment.
 
@@ -99,27 +110,33 @@ CONSTANTS = {
 Work efficiently and execute actions directly."""
 }
 
-# Import tqdm with fallback
-try:
-    from tqdm import tqdm
-    TQDM_AVAILABLE = True
-except ImportError:
-    TQDM_AVAILABLE = False
-    print("Warning: tqdm not installed. Install with: pip install tqdm")
-    class TqdmFallback:
-        def __init__(self, total=100, desc="Progress", ncols=70, bar_format=None):
-            self.total = total
-            self.desc = desc
-            self.current = 0
-        def __enter__(self):
-            return self
-        def __exit__(self, *args):
-            pass
-        def update(self, n):
-            self.current += n
-            percent = int((self.current / self.total) * 100)
-            print(f"{self.desc}: {percent}%", end='\r')
-    tqdm = TqdmFallback
+# One HTTP session for all Ollama calls so the connection is kept alive
+OLLAMA_SESSION = requests.Session()
+
+# Minimal stand-in for tqdm when it isn't installed
+class TqdmFallback:
+    def __init__(self, total=100, desc="Progress", ncols=70, bar_format=None):
+        self.total = total
+        self.desc = desc
+        self.current = 0
+    def __enter__(self):
+        return self
+    def __exit__(self, *args):
+        pass
+    def update(self, n):
+        self.current += n
+        percent = int((self.current / self.total) * 100)
+        print(f"{self.desc}: {percent}%", end='\r')
+
+@lru_cache(maxsize=1)
+def get_tqdm():
+    """Import tqdm with fallback on first use, so start-up doesn't pay for it"""
+    try:
+        from tqdm import tqdm
+        return tqdm
+    except ImportError:
+        print("Warning: tqdm not installed. Install with: pip install tqdm")
+        return TqdmFallback
 
 # Setup logging (only after config is loaded)
 def setup_logging():
@@ -167,7 +184,8 @@ def get_default_config():
             "compress_format": "zip",
             "search_case_sensitive": False,
             "search_content": True,
-            "search_max_file_kb": CONSTANTS['SEARCH_MAX_FILE_KB']
+            "search_max_file_kb": CONSTANTS['SEARCH_MAX_FILE_KB'],
+            "keep_alive": None  # e.g. "30m"; None leaves it to the Ollama server
         }
     }
 
@@ -227,23 +245,23 @@ def save_config(config):
         if os.path.exists(config_path):
             backup_path = config_path + ".backup"
             shutil.copy2(config_path, backup_path)
-            logger.info(f"Created config backup: {backup_path}")
+            logger.info("Created config backup: %s", backup_path)
         
         with open(config_path, 'w', encoding='utf-8') as f:
             json.dump(config, f, indent=4, ensure_ascii=False)
         
-        logger.info(f"Configuration saved to {config_path}")
+        logger.info("Configuration saved to %s", config_path)
         return True
     except (OSError, IOError) as e:
-        logger.error(f"File system error saving config: {e}")
+        logger.error("File system error saving config: %s", e)
         print(f"Error saving config: {e}")
         return False
     except (TypeError, ValueError) as e:
-        logger.error(f"JSON serialization error: {e}")
+        logger.error("JSON serialization error: %s", e)
         print(f"Error encoding config to JSON: {e}")
         return False
     except Exception as e:
-        logger.error(f"Unexpected error saving config: {e}")
+        logger.error("Unexpected error saving config: %s", e)
         print(f"Error saving config: {e}")
         return False
 
@@ -253,16 +271,26 @@ setup_directories()
 # Setup logging after config is loaded
 logger = setup_logging()
 
-# Global configuration
-APP_CONFIG = load_config()
-setup_directories()
-# Setup logging after config is loaded
-logger = setup_logging()
+# Characters Windows won't accept in file names
+WINDOWS_INVALID_CHARS = '<>:"|?*'
+WINDOWS_INVALID_CHAR_SET = frozenset(WINDOWS_INVALID_CHARS)
+
+# Device names Windows won't accept as file names, with or without an extension
+WINDOWS_RESERVED_NAMES = frozenset(
+    ['CON', 'PRN', 'AUX', 'NUL'] + [f'COM{i}' for i in range(1, 10)] + [f'LPT{i}' for i in range(1, 10)]
+)
 
 # File Manager Class - Built into single file
 class FileManager:
     """File management tools integrated directly into WorkspaceAI assistant"""
-    
+
+    __slots__ = (
+        'base_path', 'safe_mode', 'default_compress_format',
+        'search_case_sensitive', 'search_content', 'search_max_file_kb',
+        'search_exclude_globs', 'search_exclude_regex', 'versions', 'tags',
+        'root'
+    )
+
     def __init__(self, config=None):
         if config is None:
             config = APP_CONFIG
@@ -274,32 +302,35 @@ class FileManager:
         self.search_content = config["settings"]["search_content"]
         self.search_max_file_kb = config["settings"]["search_max_file_kb"]
         self.search_exclude_globs = ["*.zip", "*.tar", "*.gz", "*.png", "*.jpg", "*.pdf"]
+        # All exclude globs as one regex, so each file name is matched once
+        self.search_exclude_regex = re.compile("|".join(
+            fnmatch.translate(os.path.normcase(pat)) for pat in self.search_exclude_globs
+        ))
         self.versions = defaultdict(list)
         self.tags = defaultdict(list)
         
         # Ensure base directory exists
         os.makedirs(self.base_path, exist_ok=True)
+        # Resolved once; the workspace location doesn't move while running
+        self.root = Path(self.base_path).resolve()
 
     def _resolve(self, *parts: str) -> str:
         """Join workspace base_path with parts and validate for security using pathlib"""
-        root = Path(self.base_path)
-        
         # Build the full path within workspace
         if parts:
-            full_path = root / Path(*[p for p in parts if p])
+            full_path = self.root / Path(*[p for p in parts if p])
         else:
-            full_path = root
+            full_path = self.root
         
         # Resolve to absolute path and normalize
         full_path = full_path.resolve()
         
         # Security check: ensure path doesn't escape workspace directory
         try:
-            base_path = Path(self.base_path).resolve()
             # Check if the resolved path is within the workspace directory
-            full_path.relative_to(base_path)
+            full_path.relative_to(self.root)
         except ValueError:
-            logger.warning(f"Path traversal attempt blocked: {full_path}")
+            logger.warning("Path traversal attempt blocked: %s", full_path)
             raise ValueError(f"Path '{full_path}' is outside the workspace directory")
         
         return str(full_path)
@@ -310,14 +341,12 @@ class FileManager:
             raise ValueError("Filename cannot be empty")
         
         # Check for invalid characters (platform-specific)
-        if platform.system() == "Windows":
-            invalid_chars = '<>:"|?*'
-            if any(char in filename for char in invalid_chars):
-                raise ValueError(f"Filename contains invalid characters: {invalid_chars}")
+        if CURRENT_OS == "Windows":
+            if not WINDOWS_INVALID_CHAR_SET.isdisjoint(filename):
+                raise ValueError(f"Filename contains invalid characters: {WINDOWS_INVALID_CHARS}")
             
             # Check for reserved names on Windows
-            reserved_names = ['CON', 'PRN', 'AUX', 'NUL'] + [f'COM{i}' for i in range(1, 10)] + [f'LPT{i}' for i in range(1, 10)]
-            if filename.upper().split('.')[0] in reserved_names:
+            if filename.upper().partition('.')[0] in WINDOWS_RESERVED_NAMES:
                 raise ValueError(f"Filename '{filename}' is reserved and cannot be used on Windows")
         else:
             # Linux/Unix - only null character is forbidden
@@ -345,16 +374,23 @@ class FileManager:
         name, ext = os.path.splitext(file_name)
         counter = 1
         
+        # List the (already validated) folder once and probe candidate names
+        # against that snapshot; only the name picked is resolved and stat-ed
+        folder = os.path.dirname(file_path)
+        with os.scandir(folder) as entries:
+            existing = {os.path.normcase(entry.name) for entry in entries}
+        base_name = os.path.basename(name)
+        
         while True:
-            new_name = f"{name}_{counter}{ext}"
-            new_path = self._resolve(new_name)
-            if not os.path.exists(new_path):
-                return new_name
+            candidate = f"{base_name}_{counter}{ext}"
+            if os.path.normcase(candidate) not in existing:
+                new_name = f"{name}_{counter}{ext}"
+                if not os.path.exists(self._resolve(new_name)):
+                    return new_name
             counter += 1
             
             # Safety check to avoid infinite loop
             if counter > 999:
-                import time
                 timestamp = str(int(time.time()))[-6:]  # Last 6 digits of timestamp
                 return f"{name}_{timestamp}{ext}"
 
@@ -375,7 +411,7 @@ class FileManager:
             with open(file_path, "w", encoding="utf-8") as file:
                 file.write(content)
             
-            logger.info(f"Created file: {file_path}")
+            logger.info("Created file: %s", file_path)
             
             if unique_name != file_name:
                 return f"File created as '{unique_name}' (original name already existed) in workspace!"
@@ -383,13 +419,11 @@ class FileManager:
                 return f"File '{unique_name}' created successfully in workspace!"
             
         except ValueError as e:
-            logger.error(f"Validation error creating file '{file_name}': {e}")
+            logger.error("Validation error creating file '%s': %s", file_name, e)
             return f"Error: {e}"
-        except (OSError, IOError) as e:
-            logger.error(f"File system error creating '{file_name}': {e}")
-            return f"Error creating file: {e}"
         except Exception as e:
-            logger.error(f"Unexpected error creating file '{file_name}': {e}")
+            # File system errors and anything unexpected are reported the same way
+            logger.error("Error creating file '%s' (%s): %s", file_name, type(e).__name__, e)
             return f"Error creating file: {e}"
 
     def read_file(self, file_name: str) -> str:
@@ -524,7 +558,6 @@ class FileManager:
 
     def search_files(self, keyword: str, subdirectory: str = "") -> List[str]:
         """Search for files by keyword in workspace"""
-        import fnmatch
         if subdirectory:
             search_path = self._resolve(subdirectory)
         else:
@@ -532,8 +565,10 @@ class FileManager:
         matching_files = []
         case_kw = keyword if self.search_case_sensitive else keyword.lower()
 
+        skip_match = self.search_exclude_regex.match
+
         def should_skip(name: str) -> bool:
-            return any(fnmatch.fnmatch(name, pat) for pat in self.search_exclude_globs)
+            return skip_match(os.path.normcase(name)) is not None
 
         try:
             for root, dirs, files in os.walk(search_path):
@@ -697,11 +732,12 @@ class FileManager:
         file_path = self._resolve(file_name)
         try:
             metadata = os.stat(file_path)
+            time_format = "%Y-%m-%d %H:%M:%S"
             return {
                 "size": str(metadata.st_size),
-                "creation_time": datetime.fromtimestamp(metadata.st_ctime).strftime("%Y-%m-%d %H:%M:%S"),
-                "modification_time": datetime.fromtimestamp(metadata.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
-                "access_time": datetime.fromtimestamp(metadata.st_atime).strftime("%Y-%m-%d %H:%M:%S"),
+                "creation_time": time.strftime(time_format, time.localtime(metadata.st_ctime)),
+                "modification_time": time.strftime(time_format, time.localtime(metadata.st_mtime)),
+                "access_time": time.strftime(time_format, time.localtime(metadata.st_atime)),
             }
         except Exception as e:
             return f"Error getting metadata: {e}"
@@ -709,6 +745,9 @@ class FileManager:
 # Initialize file manager
 file_manager = FileManager()
 
+# Message roles replayed to the model as conversation context
+CONTEXT_ROLES = frozenset({'user', 'assistant'})
+
 class MemoryManager:
     def __init__(self, config=None):
         if config is None:
@@ -718,6 +757,7 @@ class MemoryManager:
         self.current_conversation = []
         self.recent_conversations = []  # Last 2 full conversations
         self.summarized_conversations = []  # Next 20 summarized
+        self._context_prefix = None  # Context built from past conversations
         self.load_memory()
     
     def load_memory(self):
@@ -729,6 +769,7 @@ class MemoryManager:
                 self.current_conversation = data.get('current_conversation', [])
                 self.recent_conversations = data.get('recent_conversations', [])
                 self.summarized_conversations = data.get('summarized_conversations', [])
+                self._context_prefix = None
                 print(f"📖 Loaded memory: {len(self.recent_conversations)} recent + {len(self.summarized_conversations)} summarized conversations")
             except Exception as e:
                 print(f"⚠️ Could not load memory: {e}")
@@ -757,19 +798,17 @@ class MemoryManager:
             with open(temp_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
             
-            # Atomic rename
-            if os.path.exists(self.memory_file):
-                os.replace(temp_file, self.memory_file)
-            else:
-                os.rename(temp_file, self.memory_file)
+            # Atomic rename - os.replace works whether or not the target exists
+            os.replace(temp_file, self.memory_file)
                 
-            logger.debug(f"Memory saved successfully - Current: {len(self.current_conversation)}, Recent: {len(self.recent_conversations)}, Summarized: {len(self.summarized_conversations)}")
+            logger.debug("Memory saved successfully - Current: %d, Recent: %d, Summarized: %d",
+                         len(self.current_conversation), len(self.recent_conversations), len(self.summarized_conversations))
             
         except (OSError, IOError) as e:
-            logger.error(f"File system error saving memory: {e}")
+            logger.error("File system error saving memory: %s", e)
             print(f"⚠️ Could not save memory: {e}")
         except Exception as e:
-            logger.error(f"Unexpected error saving memory: {e}")
+            logger.error("Unexpected error saving memory: %s", e)
             print(f"⚠️ Could not save memory: {e}")
     
     def add_message(self, role, content, tool_calls=None):
@@ -786,7 +825,7 @@ class MemoryManager:
         
         # Auto-save after each message (synchronous for reliability)
         self.save_memory()
-        logger.debug(f"Added {role} message to conversation, total messages: {len(self.current_conversation)}")
+        logger.debug("Added %s message to conversation, total messages: %d", role, len(self.current_conversation))
     
     def start_new_conversation(self):
         """Move current conversation to recent and start fresh"""
@@ -794,12 +833,13 @@ class MemoryManager:
             logger.debug("No current conversation to save")
             return
         
-        logger.debug(f"Moving conversation with {len(self.current_conversation)} messages to recent")
+        logger.debug("Moving conversation with %d messages to recent", len(self.current_conversation))
         
-        # Add current to recent conversations
+        # Add current to recent conversations - the list is handed over rather
+        # than copied since current_conversation is replaced with a fresh list below
         conversation_data = {
             'date': datetime.now().isoformat(),
-            'messages': self.current_conversation.copy()
+            'messages': self.current_conversation
         }
         self.recent_conversations.insert(0, conversation_data)
         
@@ -807,7 +847,7 @@ class MemoryManager:
         if len(self.recent_conversations) > CONSTANTS['MAX_RECENT_CONVERSATIONS']:
             # Move oldest recent to summarized
             oldest = self.recent_conversations.pop()
-            logger.debug(f"Moving oldest recent conversation to summarized (had {len(oldest['messages'])} messages)")
+            logger.debug("Moving oldest recent conversation to summarized (had %d messages)", len(oldest['messages']))
             summary = self.summarize_conversation(oldest['messages'])
             self.summarized_conversations.insert(0, {
                 'date': oldest['date'],
@@ -819,25 +859,28 @@ class MemoryManager:
         
         # Clear current conversation
         self.current_conversation = []
+        self._context_prefix = None
         self.save_memory()
         print(f"Started new conversation (previous conversation with {len(conversation_data['messages'])} messages saved to memory)")
-        logger.info(f"New conversation started - Recent: {len(self.recent_conversations)}, Summarized: {len(self.summarized_conversations)}")
+        logger.info("New conversation started - Recent: %d, Summarized: %d",
+                    len(self.recent_conversations), len(self.summarized_conversations))
     
     def summarize_conversation(self, messages):
         """Create AI summary of conversation"""
         try:
             # Build summary prompt
-            conversation_text = ""
-            for msg in messages[-CONSTANTS['MEMORY_CONTEXT_MESSAGES']:]:  # Last 10 messages only
-                if msg['role'] in ['user', 'assistant']:
-                    conversation_text += f"{msg['role']}: {msg['content'][:200]}\n"
+            conversation_text = "".join(
+                f"{msg['role']}: {msg['content'][:200]}\n"
+                for msg in messages[-CONSTANTS['MEMORY_CONTEXT_MESSAGES']:]  # Last 10 messages only
+                if msg['role'] in CONTEXT_ROLES
+            )
             
             if not conversation_text.strip():
                 return "Empty conversation"
             
             summary_prompt = f"Summarize this conversation in 2-3 sentences, focusing on key topics, files created/modified, and important context:\n\n{conversation_text}"
             
-            response = requests.post("http://localhost:11434/api/chat", json={
+            response = OLLAMA_SESSION.post("http://localhost:11434/api/chat", json={
                 "model": "qwen2.5:3b",
                 "messages": [{"role": "user", "content": summary_prompt}],
                 "stream": False
@@ -852,6 +895,23 @@ class MemoryManager:
     
     def get_context_messages(self):
         """Build context from memory for API calls"""
+        if self._context_prefix is None:
+            self._context_prefix = self._build_context_prefix()
+        context_messages = list(self._context_prefix)
+        
+        # Add current conversation
+        for msg in self.current_conversation:
+            if msg['role'] in CONTEXT_ROLES:
+                context_messages.append({
+                    "role": msg['role'],
+                    "content": msg['content']
+                })
+        
+        return context_messages
+    
+    def _build_context_prefix(self):
+        """Build the system prompt, summaries and recent conversations, which
+        only change when a conversation is archived or memory is reloaded"""
         context_messages = []
         
         # Add system prompt for tool usage
@@ -862,29 +922,23 @@ class MemoryManager:
         
         # Add summaries as system context
         if self.summarized_conversations:
-            summaries_text = "Previous conversation context:\n"
-            for conv in reversed(self.summarized_conversations):  # Oldest first
-                date = conv['date'][:10]
-                summaries_text += f"- {date}: {conv['summary']}\n"
+            summary_lines = ["Previous conversation context:"]
+            summary_lines.extend(
+                f"- {conv['date'][:10]}: {conv['summary']}"
+                for conv in reversed(self.summarized_conversations)  # Oldest first
+            )
+            summaries_text = "\n".join(summary_lines) + "\n"
             context_messages.append({"role": "system", "content": summaries_text})
         
         # Add recent conversations
         for conv in reversed(self.recent_conversations):  # Oldest first
             for msg in conv['messages']:
-                if msg['role'] in ['user', 'assistant']:
+                if msg['role'] in CONTEXT_ROLES:
                     context_messages.append({
                         "role": msg['role'],
                         "content": msg['content']
                     })
         
-        # Add current conversation
-        for msg in self.current_conversation:
-            if msg['role'] in ['user', 'assistant']:
-                context_messages.append({
-                    "role": msg['role'],
-                    "content": msg['content']
-                })
-        
         return context_messages
     
     def reset_memory(self):
@@ -892,346 +946,486 @@ class MemoryManager:
         self.current_conversation = []
         self.recent_conversations = []
         self.summarized_conversations = []
+        self._context_prefix = None
 
 # Global memory manager
 memory = MemoryManager()
 
+# Linux package managers in order of preference
+LINUX_PACKAGE_MANAGERS = ("apt", "dnf", "yum", "pacman", "zypper", "snap")
+
+# Distro IDs from /etc/os-release mapped to their native package manager
+OS_RELEASE_PACKAGE_MANAGERS = {
+    "debian": "apt",
+    "ubuntu": "apt",
+    "fedora": "dnf",
+    "rhel": "dnf",
+    "centos": "dnf",
+    "arch": "pacman",
+    "opensuse": "zypper",
+    "suse": "zypper",
+}
+
+def read_os_release_ids():
+    """Return the ID and ID_LIKE entries from /etc/os-release, most specific first"""
+    try:
+        with open("/etc/os-release", "r", encoding="utf-8") as f:
+            fields = dict(
+                line.rstrip("\n").split("=", 1) for line in f if "=" in line
+            )
+    except OSError:
+        return []
+    ids = fields.get("ID", "") + " " + fields.get("ID_LIKE", "")
+    return ids.replace('"', "").replace("'", "").split()
+
+def find_commands_on_path(commands):
+    """Return which of the given commands are executables on PATH, listing each
+    PATH directory once rather than probing every command separately"""
+    wanted = set(commands)
+    found = set()
+    for directory in dict.fromkeys(os.environ.get("PATH", "").split(os.pathsep)):
+        if not directory:
+            continue
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if (entry.name in wanted and entry.is_file()
+                            and os.access(entry.path, os.X_OK)):
+                        found.add(entry.name)
+        except OSError:
+            continue
+        if found == wanted:
+            break
+    return found
+
+@lru_cache(maxsize=1)
 def detect_linux_package_manager():
-    """Detect the available package manager on Linux systems"""
-    if platform.system() != "Linux":
+    """Detect the available package manager on Linux systems (cached, the
+    installed managers don't change while running)"""
+    if CURRENT_OS != "Linux":
         return None
     
-    # Check for package managers in order of preference
-    managers = [
-        ("apt", ["apt", "--version"]),
-        ("dnf", ["dnf", "--version"]), 
-        ("yum", ["yum", "--version"]),
-        ("pacman", ["pacman", "--version"]),
-        ("zypper", ["zypper", "--version"]),
-        ("snap", ["snap", "--version"])
-    ]
+    # A PATH lookup is enough to tell whether a manager is installed, no need to run it
+    installed = find_commands_on_path(LINUX_PACKAGE_MANAGERS)
     
-    for manager, command in managers:
-        try:
-            # Try to run the version command to see if manager exists
-            result = subprocess.run(command, 
-                                  stdout=subprocess.DEVNULL, 
-                                  stderr=subprocess.DEVNULL,
-                                  timeout=5)
-            if result.returncode == 0:  # Command succeeded
-                return manager
-        except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
-            continue
+    # The distro usually names its package manager outright; still confirm it
+    # is on PATH (e.g. older RHEL/CentOS ship yum rather than dnf)
+    for distro_id in read_os_release_ids():
+        manager = OS_RELEASE_PACKAGE_MANAGERS.get(distro_id.split("-")[0])
+        if manager in installed:
+            return manager
+    
+    # Check for package managers in order of preference
+    for manager in LINUX_PACKAGE_MANAGERS:
+        if manager in installed:
+            return manager
     
     return "unknown"
 
-def show_progress(description, duration=None):
-    """Show progress bar for operations"""
+# Persistent worker threads for progress bars, reused by every API call and
+# slow tool call instead of starting a new thread each time
+PROGRESS_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="progress")
+
+def show_progress(description, duration=None, done=None):
+    """Show progress bar for operations, finishing early once done is set"""
     if duration is None:
         duration = CONSTANTS['PROGRESS_DURATION']
-    with tqdm(total=100, desc=description, ncols=70, bar_format='{desc}: {percentage:3.0f}%|{bar}|') as pbar:
-        for i in range(100):
-            time.sleep(duration/100)
-            pbar.update(1)
+    if done is None:
+        done = threading.Event()
+    if done.wait(CONSTANTS['PROGRESS_DELAY']):
+        return
+    with get_tqdm()(total=100, desc=description, ncols=70, bar_format='{desc}: {percentage:3.0f}%|{bar}|') as pbar:
+        steps = CONSTANTS['PROGRESS_STEPS']
+        step_size = 100 // steps
+        for i in range(steps):
+            if done.wait(duration/steps):
+                pbar.update(100 - i * step_size)
+                break
+            pbar.update(step_size)
 
-def get_all_tool_schemas():
-    """Build tool schemas for all file management functions"""
-    return [
-        {
-            "type": "function",
-            "function": {
-                "name": "create_file",
-                "description": "Create a new file with content in workspace. Use for 'create a script', 'make a file', 'generate code', etc. Supports all file types (.py, .txt, .js, etc.)",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "file_name": {"type": "string", "description": "File name or path within workspace (e.g., 'backup_script.py' or 'folder/notes.txt')"},
-                        "content": {"type": "string", "description": "Text content to write (code, documentation, etc.)"}
-                    },
-                    "required": ["file_name"]
-                }
+def start_progress(description, duration=None):
+    """Run show_progress in the background; set the returned event to finish it"""
+    done = threading.Event()
+    return done, PROGRESS_EXECUTOR.submit(show_progress, description, duration, done)
+
+def finish_progress(progress):
+    """Stop a progress bar started with start_progress and wait for it to close.
+    Accepts None and is safe to call more than once"""
+    if progress is None:
+        return
+    done, future = progress
+    done.set()
+    future.result()
+
+# Tool schemas for all file management functions, built once at import
+TOOL_SCHEMAS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "create_file",
+            "description": "Create a new file with content in workspace. Use for 'create a script', 'make a file', 'generate code', etc. Supports all file types (.py, .txt, .js, etc.)",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "file_name": {"type": "string", "description": "File name or path within workspace (e.g., 'backup_script.py' or 'folder/notes.txt')"},
+                    "content": {"type": "string", "description": "Text content to write (code, documentation, etc.)"}
+                },
+                "required": ["file_name"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "read_file",
-                "description": "Read the entire content of a text file from workspace",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "file_name": {"type": "string", "description": "File name or path within workspace"}
-                    },
-                    "required": ["file_name"]
-                }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "read_file",
+            "description": "Read the entire content of a text file from workspace",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "file_name": {"type": "string", "description": "File name or path within workspace"}
+                },
+                "required": ["file_name"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "write_to_file",
-                "description": "Write text content to a file in workspace",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "file_name": {"type": "string", "description": "File name or path within workspace"},
-                        "content": {"type": "string", "description": "Text content to write"}
-                    },
-                    "required": ["file_name", "content"]
-                }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "write_to_file",
+            "description": "Write text content to a file in workspace",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "file_name": {"type": "string", "description": "File name or path within workspace"},
+                    "content": {"type": "string", "description": "Text content to write"}
+                },
+                "required": ["file_name", "content"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "list_files",
-                "description": "List files in workspace directory or subdirectory",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "subdirectory": {"type": "string", "description": "Subdirectory within workspace to list (optional, defaults to root)"}
-                    }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "list_files",
+            "description": "List files in workspace directory or subdirectory",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "subdirectory": {"type": "string", "description": "Subdirectory within workspace to list (optional, defaults to root)"}
                 }
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "create_folder",
-                "description": "Create a new folder in workspace",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "folder_name": {"type": "string", "description": "Name or path of the folder to create within workspace"}
-                    },
-                    "required": ["folder_name"]
-                }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "create_folder",
+            "description": "Create a new folder in workspace",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "folder_name": {"type": "string", "description": "Name or path of the folder to create within workspace"}
+                },
+                "required": ["folder_name"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "delete_file",
-                "description": "Delete a file from workspace (blocked when safe_mode is True)",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "file_name": {"type": "string", "description": "Name or path of the file to delete within workspace"}
-                    },
-                    "required": ["file_name"]
-                }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "delete_file",
+            "description": "Delete a file from workspace (blocked when safe_mode is True)",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "file_name": {"type": "string", "description": "Name or path of the file to delete within workspace"}
+                },
+                "required": ["file_name"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "delete_folder",
-                "description": "Delete a folder from workspace (blocked when safe_mode is True)",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "folder_name": {"type": "string", "description": "Name or path of the folder to delete within workspace"}
-                    },
-                    "required": ["folder_name"]
-                }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "delete_folder",
+            "description": "Delete a folder from workspace (blocked when safe_mode is True)",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "folder_name": {"type": "string", "description": "Name or path of the folder to delete within workspace"}
+                },
+                "required": ["folder_name"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "copy_folder",
-                "description": "Copy a folder and all its contents within workspace",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "src_folder": {"type": "string", "description": "Source folder name or path within workspace"},
-                        "dest_folder": {"type": "string", "description": "Destination folder name or path within workspace"}
-                    },
-                    "required": ["src_folder", "dest_folder"]
-                }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "copy_folder",
+            "description": "Copy a folder and all its contents within workspace",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "src_folder": {"type": "string", "description": "Source folder name or path within workspace"},
+                    "dest_folder": {"type": "string", "description": "Destination folder name or path within workspace"}
+                },
+                "required": ["src_folder", "dest_folder"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "search_files",
-                "description": "Search for files by name pattern or content keyword in workspace. Use for 'find files', 'search for files', 'list Python files', etc.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "keyword": {"type": "string", "description": "Keyword to search for in filenames (e.g., '.py' for Python files, 'config' for config files) or file contents"},
-                        "subdirectory": {"type": "string", "description": "Subdirectory within workspace to search (optional)"}
-                    },
-                    "required": ["keyword"]
-                }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "search_files",
+            "description": "Search for files by name pattern or content keyword in workspace. Use for 'find files', 'search for files', 'list Python files', etc.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "keyword": {"type": "string", "description": "Keyword to search for in filenames (e.g., '.py' for Python files, 'config' for config files) or file contents"},
+                    "subdirectory": {"type": "string", "description": "Subdirectory within workspace to search (optional)"}
+                },
+                "required": ["keyword"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "compress_file",
-                "description": "Compress a file using zip, tar, or gztar format in workspace",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "file_name": {"type": "string", "description": "Source file to compress within workspace"},
-                        "output_filename": {"type": "string", "description": "Output archive name within workspace"},
-                        "format": {"type": "string", "description": "zip | tar | gztar"}
-                    },
-                    "required": ["file_name", "output_filename"]
-                }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "compress_file",
+            "description": "Compress a file using zip, tar, or gztar format in workspace",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "file_name": {"type": "string", "description": "Source file to compress within workspace"},
+                    "output_filename": {"type": "string", "description": "Output archive name within workspace"},
+                    "format": {"type": "string", "description": "zip | tar | gztar"}
+                },
+                "required": ["file_name", "output_filename"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "backup_files",
-                "description": "Copy existing files from source directory to backup directory. Use ONLY when user wants to backup existing files, NOT for creating new backup scripts.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "source_path": {"type": "string", "description": "Source directory"},
-                        "backup_path": {"type": "string", "description": "Backup directory"}
-                    },
-                    "required": ["source_path", "backup_path"]
-                }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "backup_files",
+            "description": "Copy existing files from source directory to backup directory. Use ONLY when user wants to backup existing files, NOT for creating new backup scripts.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "source_path": {"type": "string", "description": "Source directory"},
+                    "backup_path": {"type": "string", "description": "Backup directory"}
+                },
+                "required": ["source_path", "backup_path"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "generate_install_commands",
-                "description": "Generate cross-platform installation commands for popular software (Windows/Linux)",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "software": {"type": "string", "description": "Software name (e.g., 'python', 'git', 'vscode', 'nodejs')"},
-                        "method": {"type": "string", "description": "Installation method: 'winget' (Windows), 'apt'/'dnf'/'pacman' (Linux), 'pip', 'docker', 'auto' (default)"}
-                    },
-                    "required": ["software"]
-                }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "generate_install_commands",
+            "description": "Generate cross-platform installation commands for popular software (Windows/Linux)",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "software": {"type": "string", "description": "Software name (e.g., 'python', 'git', 'vscode', 'nodejs')"},
+                    "method": {"type": "string", "description": "Installation method: 'winget' (Windows), 'apt'/'dnf'/'pacman' (Linux), 'pip', 'docker', 'auto' (default)"}
+                },
+                "required": ["software"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "copy_file",
-                "description": "Copy a file within the workspace folder from source to destination",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "src_file": {"type": "string", "description": "Source file name (workspace-only)"},
-                        "dest_file": {"type": "string", "description": "Destination file name (workspace-only)"}
-                    },
-                    "required": ["src_file", "dest_file"]
-                }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "copy_file",
+            "description": "Copy a file within the workspace folder from source to destination",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "src_file": {"type": "string", "description": "Source file name (workspace-only)"},
+                    "dest_file": {"type": "string", "description": "Destination file name (workspace-only)"}
+                },
+                "required": ["src_file", "dest_file"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "move_file",
-                "description": "Move a file within the workspace folder from source to destination",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "src_file": {"type": "string", "description": "Source file name (workspace-only)"},
-                        "dest_file": {"type": "string", "description": "Destination file name (workspace-only)"}
-                    },
-                    "required": ["src_file", "dest_file"]
-                }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "move_file",
+            "description": "Move a file within the workspace folder from source to destination",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "src_file": {"type": "string", "description": "Source file name (workspace-only)"},
+                    "dest_file": {"type": "string", "description": "Destination file name (workspace-only)"}
+                },
+                "required": ["src_file", "dest_file"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "read_json_file",
-                "description": "Read and parse a JSON file from the workspace folder",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "file_name": {"type": "string", "description": "JSON file name (workspace-only)"}
-                    },
-                    "required": ["file_name"]
-                }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "read_json_file",
+            "description": "Read and parse a JSON file from the workspace folder",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "file_name": {"type": "string", "description": "JSON file name (workspace-only)"}
+                },
+                "required": ["file_name"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "write_json_file",
-                "description": "Write data to a JSON file in the workspace folder",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "file_name": {"type": "string", "description": "JSON file name (workspace-only)"},
-                        "content": {"type": "object", "description": "Data to write as JSON"}
-                    },
-                    "required": ["file_name", "content"]
-                }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "write_json_file",
+            "description": "Write data to a JSON file in the workspace folder",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "file_name": {"type": "string", "description": "JSON file name (workspace-only)"},
+                    "content": {"type": "object", "description": "Data to write as JSON"}
+                },
+                "required": ["file_name", "content"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "write_txt_file",
-                "description": "Write content to a .txt file in the workspace folder",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "file_name": {"type": "string", "description": "File name (will auto-add .txt extension) (workspace-only)"},
-                        "content": {"type": "string", "description": "Content to write"}
-                    },
-                    "required": ["file_name", "content"]
-                }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "write_txt_file",
+            "description": "Write content to a .txt file in the workspace folder",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "file_name": {"type": "string", "description": "File name (will auto-add .txt extension) (workspace-only)"},
+                    "content": {"type": "string", "description": "Content to write"}
+                },
+                "required": ["file_name", "content"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "write_md_file",
-                "description": "Write content to a .md (markdown) file in the workspace folder",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "file_name": {"type": "string", "description": "File name (will auto-add .md extension) (workspace-only)"},
-                        "content": {"type": "string", "description": "Markdown content to write"}
-                    },
-                    "required": ["file_name", "content"]
-                }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "write_md_file",
+            "description": "Write content to a .md (markdown) file in the workspace folder",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "file_name": {"type": "string", "description": "File name (will auto-add .md extension) (workspace-only)"},
+                    "content": {"type": "string", "description": "Markdown content to write"}
+                },
+                "required": ["file_name", "content"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "write_json_from_string",
-                "description": "Write content to a .json file from string content in the workspace folder",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "file_name": {"type": "string", "description": "File name (will auto-add .json extension) (workspace-only)"},
-                        "content": {"type": "string", "description": "JSON content as string"}
-                    },
-                    "required": ["file_name", "content"]
-                }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "write_json_from_string",
+            "description": "Write content to a .json file from string content in the workspace folder",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "file_name": {"type": "string", "description": "File name (will auto-add .json extension) (workspace-only)"},
+                    "content": {"type": "string", "description": "JSON content as string"}
+                },
+                "required": ["file_name", "content"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "get_file_metadata",
-                "description": "Get metadata information about a file (size, dates) from the workspace folder",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "file_name": {"type": "string", "description": "File name (workspace-only)"}
-                    },
-                    "required": ["file_name"]
-                }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_file_metadata",
+            "description": "Get metadata information about a file (size, dates) from the workspace folder",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "file_name": {"type": "string", "description": "File name (workspace-only)"}
+                },
+                "required": ["file_name"]
             }
         }
-        # File management tools ready for WorkspaceAI
-    ]
+    }
+    # File management tools ready for WorkspaceAI
+]
+
+def get_all_tool_schemas():
+    """Return tool schemas for all file management functions"""
+    return TOOL_SCHEMAS
+
+# FileManager methods the model may call, taken from the advertised schemas so
+# helpers such as _resolve can't be reached through a tool call
+FILE_TOOL_NAMES = frozenset(
+    schema['function']['name'] for schema in TOOL_SCHEMAS
+    if hasattr(FileManager, schema['function']['name'])
+)
+
+# Tools that get a progress bar while they run
+SLOW_TOOLS = frozenset({'search_files', 'backup_files', 'compress_file'})
+
+# Read-only file tools whose results are reused while their target is unchanged
+CACHEABLE_TOOLS = frozenset({'read_file', 'read_json_file', 'list_files'})
+# Read-only tools that aren't cached (the stat key doesn't cover their output)
+# but also don't invalidate the cache
+UNCACHED_READ_TOOLS = frozenset({'get_file_metadata'})
+tool_result_cache = OrderedDict()
+
+def get_tool_cache_key(function_name, function_args):
+    """Build a cache key for a read-only tool call, or None if it can't be cached.
+    The target's mtime and size are part of the key so edits made outside
+    WorkspaceAI are picked up"""
+    if function_name not in CACHEABLE_TOOLS:
+        return None
+    if function_name == 'list_files':
+        target = function_args.get('subdirectory', '')
+    else:
+        target = function_args.get('file_name')
+    if target is None:
+        return None
+    try:
+        stat = os.stat(file_manager._resolve(target))
+    except (OSError, ValueError):
+        return None
+    return (function_name, json.dumps(function_args, sort_keys=True), stat.st_mtime_ns, stat.st_size)
+
+def run_file_tool(function_name, function_args):
+    """Run a FileManager tool, serving repeated read-only calls from the cache"""
+    if function_name in UNCACHED_READ_TOOLS:
+        return getattr(file_manager, function_name)(**function_args)
+    
+    cache_key = get_tool_cache_key(function_name, function_args)
+    if cache_key is None:
+        # Anything that isn't a cacheable read may have changed the workspace
+        tool_result_cache.clear()
+        return getattr(file_manager, function_name)(**function_args)
+    
+    if cache_key in tool_result_cache:
+        tool_result_cache.move_to_end(cache_key)
+        return tool_result_cache[cache_key]
+    
+    result = getattr(file_manager, function_name)(**function_args)
+    tool_result_cache[cache_key] = result
+    if len(tool_result_cache) > CONSTANTS['TOOL_CACHE_SIZE']:
+        tool_result_cache.popitem(last=False)
+    return result
+
+# System messages sent ahead of tool-enabled requests, built once at import
+TOOL_ENFORCEMENT_TEXT = "TOOLS ARE AVAILABLE AND REQUIRED: The user request requires file operations. You MUST use the available tools immediately. Do not provide explanations or alternatives - execute the file operation directly using the appropriate tool."
+TOOL_ENFORCEMENT_MESSAGE = {"role": "system", "content": TOOL_ENFORCEMENT_TEXT}
+CREATE_SCRIPT_ENFORCEMENT_MESSAGE = {
+    "role": "system",
+    "content": TOOL_ENFORCEMENT_TEXT + "\n\nSPECIFIC GUIDANCE: 'Create a script' means make a NEW FILE with code - use create_file tool, NOT backup_files or other operation tools."
+}
+FIND_FILES_ENFORCEMENT_MESSAGE = {
+    "role": "system",
+    "content": TOOL_ENFORCEMENT_TEXT + "\n\nSPECIFIC GUIDANCE: 'Find files' means search for existing files - use search_files tool with appropriate keyword (e.g. '.py' for Python files)."
+}
 
 def call_ollama_with_tools(prompt: str, model: Optional[str] = None, use_tools: bool = True):
     """Call Ollama with conversation memory and tools"""
@@ -1239,28 +1433,25 @@ def call_ollama_with_tools(prompt: str, model: Optional[str] = None, use_tools:
     if model is None:
         model = APP_CONFIG['settings']['model']
     
+    # Build request with conversation context before recording the prompt,
+    # otherwise the prompt is sent twice (from memory and appended below)
+    messages = memory.get_context_messages()
+
     # Add user message to memory
     memory.add_message("user", prompt)
     
-    # Build request with conversation context
-    messages = memory.get_context_messages()
-    
     # If tools should be used, add enforcement message
     if use_tools:
         # Check for specific ambiguous patterns and provide targeted guidance
         prompt_lower = prompt.lower()
-        enforcement_msg = "TOOLS ARE AVAILABLE AND REQUIRED: The user request requires file operations. You MUST use the available tools immediately. Do not provide explanations or alternatives - execute the file operation directly using the appropriate tool."
         
         # Add specific guidance for common confusions
         if "create" in prompt_lower and "script" in prompt_lower:
-            enforcement_msg += "\n\nSPECIFIC GUIDANCE: 'Create a script' means make a NEW FILE with code - use create_file tool, NOT backup_files or other operation tools."
+            messages.append(CREATE_SCRIPT_ENFORCEMENT_MESSAGE)
         elif "find" in prompt_lower and "files" in prompt_lower:
-            enforcement_msg += "\n\nSPECIFIC GUIDANCE: 'Find files' means search for existing files - use search_files tool with appropriate keyword (e.g. '.py' for Python files)."
-        
-        messages.append({
-            "role": "system", 
-            "content": enforcement_msg
-        })
+            messages.append(FIND_FILES_ENFORCEMENT_MESSAGE)
+        else:
+            messages.append(TOOL_ENFORCEMENT_MESSAGE)
     
     messages.append({"role": "user", "content": prompt})
     
@@ -1270,14 +1461,18 @@ def call_ollama_with_tools(prompt: str, model: Optional[str] = None, use_tools:
         "stream": False
     }
     
+    # Only override the server's OLLAMA_KEEP_ALIVE when the user asked to
+    keep_alive = APP_CONFIG['settings'].get('keep_alive')
+    if keep_alive is not None:
+        request_data["keep_alive"] = keep_alive
+    
     if use_tools:
         request_data["tools"] = get_all_tool_schemas()
     
     # Show progress for API call if it might be slow
-    progress_thread = None
+    progress = None
     if len(messages) > 10:  # Lots of context
-        progress_thread = threading.Thread(target=show_progress, args=("Processing with context", 3), daemon=True)
-        progress_thread.start()
+        progress = start_progress("Processing with context", 3)
     
     # Ollama API call with timeout and retry logic
     host = APP_CONFIG['settings']['ollama_host']
@@ -1285,47 +1480,51 @@ def call_ollama_with_tools(prompt: str, model: Optional[str] = None, use_tools:
     timeout = CONSTANTS['API_TIMEOUT']
     response = None
     
-    for attempt in range(max_retries):
-        try:
-            logger.info(f"Calling Ollama API (attempt {attempt + 1}/{max_retries})")
-            response = requests.post(
-                f"http://{host}/api/chat", 
-                json=request_data,
-                timeout=timeout
-            )
+    try:
+        for attempt in range(max_retries):
+            try:
+                logger.info("Calling Ollama API (attempt %s/%s)", attempt + 1, max_retries)
+                response = OLLAMA_SESSION.post(
+                    f"http://{host}/api/chat", 
+                    json=request_data,
+                    timeout=timeout
+                )
             
-            if response.status_code == 200:
-                break
-            else:
-                logger.warning(f"Ollama API returned status {response.status_code}: {response.text}")
+                if response.status_code == 200:
+                    break
+                else:
+                    logger.warning("Ollama API returned status %s: %s", response.status_code, response.text)
+                    if attempt == max_retries - 1:
+                        print(f"Error: {response.status_code} - {response.text}")
+                        return
+                
+            except requests.exceptions.Timeout:
+                logger.warning("Ollama API timeout (attempt %s/%s)", attempt + 1, max_retries)
                 if attempt == max_retries - 1:
-                    print(f"Error: {response.status_code} - {response.text}")
+                    print(f"Error: Ollama API timeout after {timeout}s")
                     return
                 
-        except requests.exceptions.Timeout:
-            logger.warning(f"Ollama API timeout (attempt {attempt + 1}/{max_retries})")
-            if attempt == max_retries - 1:
-                print(f"Error: Ollama API timeout after {timeout}s")
-                return
-                
-        except requests.exceptions.ConnectionError:
-            logger.warning(f"Ollama connection failed (attempt {attempt + 1}/{max_retries})")
-            if attempt == max_retries - 1:
-                print("Error: Could not connect to Ollama. Is it running?")
-                return
+            except requests.exceptions.ConnectionError:
+                logger.warning("Ollama connection failed (attempt %s/%s)", attempt + 1, max_retries)
+                if attempt == max_retries - 1:
+                    print("Error: Could not connect to Ollama. Is it running?")
+                    return
                 
-        except Exception as e:
-            logger.error(f"Unexpected error calling Ollama: {e}")
-            if attempt == max_retries - 1:
-                print(f"Error: {e}")
-                return
+            except Exception as e:
+                logger.error("Unexpected error calling Ollama: %s", e)
+                if attempt == max_retries - 1:
+                    print(f"Error: {e}")
+                    return
         
-        # Wait before retry
-        if attempt < max_retries - 1:
-            time.sleep(2 ** attempt)  # Exponential backoff
+            # Wait before retry
+            if attempt < max_retries - 1:
+                time.sleep(2 ** attempt)  # Exponential backoff
     
-    if progress_thread:
-        progress_thread.join()
+    finally:
+        # Also stop the bar on early returns and interrupts, otherwise it keeps
+        # drawing over the error and the next prompt
+        if progress:
+            finish_progress(progress)
     
     # Check if we got a valid response
     if response is None or response.status_code != 200:
@@ -1348,35 +1547,36 @@ def call_ollama_with_tools(prompt: str, model: Optional[str] = None, use_tools:
         
         # Validate tool usage when expected
         if use_tools and not tool_calls_data and assistant_content:
-            logger.warning(f"Expected tools but got conversational response: '{assistant_content[:100]}...'")
+            logger.warning("Expected tools but got conversational response: '%s...'", assistant_content[:100])
             print(f"{CYAN}⚠️  Note: Expected file operation but got conversational response. Try 'tools: {prompt}' to force tool usage.{RESET}")
         elif use_tools and tool_calls_data:
-            logger.info(f"Tools used correctly: {len(tool_calls_data)} tool calls")
+            logger.info("Tools used correctly: %s tool calls", len(tool_calls_data))
         
         # Handle tool calls
         if tool_calls_data:
             for tool_call in tool_calls_data:
-                function_name = tool_call["function"]["name"]
-                function_args = tool_call["function"]["arguments"]
+                function = tool_call["function"]
+                function_name = function["name"]
+                function_args = function.get("arguments") or {}
                 
                 print(f"\n🔧 Tool Call: {function_name}")
                 print(f"Arguments: {json.dumps(function_args, indent=2)}")
                 
                 # Show progress for potentially slow operations
-                slow_operations = ['search_files', 'backup_files', 'compress_file']
-                progress_thread = None
-                if function_name in slow_operations:
-                    progress_thread = threading.Thread(target=show_progress, args=(f"Running {function_name}", 2), daemon=True)
-                    progress_thread.start()
+                progress = None
+                if function_name in SLOW_TOOLS:
+                    progress = start_progress(f"Running {function_name}", 2)
                 
                 # Execute the tool function
                 try:
-                    if hasattr(file_manager, function_name):
-                        result = getattr(file_manager, function_name)(**function_args)
+                    if function_name in FILE_TOOL_NAMES:
+                        result = run_file_tool(function_name, function_args)
+                        finish_progress(progress)
                         print(f"✅ Result: {result}")
                         memory.add_message("tool", f"{function_name}: {result}")
                     elif function_name == "generate_install_commands":
                         result = generate_install_commands(**function_args)
+                        finish_progress(progress)
                         print(f"✅ Generated Commands:")
                         print(result)
                         memory.add_message("tool", f"Generated install commands: {result}")
@@ -1387,307 +1587,357 @@ def call_ollama_with_tools(prompt: str, model: Optional[str] = None, use_tools:
                         memory.add_message("tool", f"Error: {error_msg}")
                         
                 except Exception as e:
+                    finish_progress(progress)
                     error_msg = f"Error executing {function_name}: {e}"
                     logger.error(error_msg)
                     print(f"❌ {error_msg}")
                     memory.add_message("tool", error_msg)
-                
-                if progress_thread is not None:
-                    progress_thread.join()
+                finally:
+                    # Interrupts skip the calls above; stop the bar regardless
+                    finish_progress(progress)
                     
     except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON response from Ollama: {e}")
+        logger.error("Invalid JSON response from Ollama: %s", e)
         print("Error: Invalid response from Ollama")
     except KeyError as e:
-        logger.error(f"Missing expected field in Ollama response: {e}")
+        logger.error("Missing expected field in Ollama response: %s", e)
         print("Error: Unexpected response format from Ollama")
     except Exception as e:
-        logger.error(f"Error processing Ollama response: {e}")
+        logger.error("Error processing Ollama response: %s", e)
         print(f"Error processing response: {e}")
 
-def generate_install_commands(software, method="auto"):
-    """Generate installation commands for popular software (cross-platform)"""
-    
-    software = software.lower().strip()
-    method = method.lower().strip()
-    current_os = platform.system()
-    
-    # Cross-platform software database
-    software_db = {
-        "python": {
-            "description": "Python programming language",
-            "windows": {
-                "winget": "winget install Python.Python.3.12",
-                "direct": "Download from: https://python.org/downloads/\n- Choose 'Add to PATH' during installation"
-            },
-            "linux": {
-                "apt": "sudo apt update && sudo apt install python3 python3-pip",
-                "dnf": "sudo dnf install python3 python3-pip",
-                "yum": "sudo yum install python3 python3-pip", 
-                "pacman": "sudo pacman -S python python-pip",
-                "zypper": "sudo zypper install python3 python3-pip",
-                "snap": "sudo snap install python3 --classic",
-                "direct": "Download from: https://python.org/downloads/"
-            }
+def freeze_mapping(mapping):
+    """Wrap a nested dict in read-only MappingProxyType views"""
+    return MappingProxyType({
+        key: freeze_mapping(value) if isinstance(value, dict) else value
+        for key, value in mapping.items()
+    })
+
+# Cross-platform software database for generate_install_commands
+SOFTWARE_DB = freeze_mapping({
+    "python": {
+        "description": "Python programming language",
+        "windows": {
+            "winget": "winget install Python.Python.3.12",
+            "direct": "Download from: https://python.org/downloads/\n- Choose 'Add to PATH' during installation"
         },
-        "git": {
-            "description": "Version control system",
-            "windows": {
-                "winget": "winget install Git.Git",
-                "direct": "Download from: https://git-scm.com/downloads"
-            },
-            "linux": {
-                "apt": "sudo apt update && sudo apt install git",
-                "dnf": "sudo dnf install git",
-                "yum": "sudo yum install git",
-                "pacman": "sudo pacman -S git",
-                "zypper": "sudo zypper install git",
-                "snap": "sudo snap install git --classic",
-                "direct": "sudo apt install git  # or use your distro's package manager"
-            }
+        "linux": {
+            "apt": "sudo apt update && sudo apt install python3 python3-pip",
+            "dnf": "sudo dnf install python3 python3-pip",
+            "yum": "sudo yum install python3 python3-pip", 
+            "pacman": "sudo pacman -S python python-pip",
+            "zypper": "sudo zypper install python3 python3-pip",
+            "snap": "sudo snap install python3 --classic",
+            "direct": "Download from: https://python.org/downloads/"
+        }
+    },
+    "git": {
+        "description": "Version control system",
+        "windows": {
+            "winget": "winget install Git.Git",
+            "direct": "Download from: https://git-scm.com/downloads"
         },
-        "vscode": {
-            "description": "Code editor",
-            "windows": {
-                "winget": "winget install Microsoft.VisualStudioCode",
-                "direct": "Download from: https://code.visualstudio.com/download"
-            },
-            "linux": {
-                "apt": "wget -qO- https://packages.microsoft.com/keys/microsoft.asc | gpg --dearmor > packages.microsoft.gpg\nsudo install -o root -g root -m 644 packages.microsoft.gpg /etc/apt/trusted.gpg.d/\nsudo sh -c 'echo \"deb [arch=amd64,arm64,armhf signed-by=/etc/apt/trusted.gpg.d/packages.microsoft.gpg] https://packages.microsoft.com/repos/code stable main\" > /etc/apt/sources.list.d/vscode.list'\nsudo apt update && sudo apt install code",
-                "dnf": "sudo rpm --import https://packages.microsoft.com/keys/microsoft.asc\nsudo sh -c 'echo -e \"[code]\\nname=Visual Studio Code\\nbaseurl=https://packages.microsoft.com/yumrepos/vscode\\nenabled=1\\ngpgcheck=1\\ngpgkey=https://packages.microsoft.com/keys/microsoft.asc\" > /etc/yum.repos.d/vscode.repo'\nsudo dnf install code",
-                "snap": "sudo snap install code --classic",
-                "direct": "Download .deb/.rpm from: https://code.visualstudio.com/download"
-            }
+        "linux": {
+            "apt": "sudo apt update && sudo apt install git",
+            "dnf": "sudo dnf install git",
+            "yum": "sudo yum install git",
+            "pacman": "sudo pacman -S git",
+            "zypper": "sudo zypper install git",
+            "snap": "sudo snap install git --classic",
+            "direct": "sudo apt install git  # or use your distro's package manager"
+        }
+    },
+    "vscode": {
+        "description": "Code editor",
+        "windows": {
+            "winget": "winget install Microsoft.VisualStudioCode",
+            "direct": "Download from: https://code.visualstudio.com/download"
         },
-        "nodejs": {
-            "description": "JavaScript runtime",
-            "windows": {
-                "winget": "winget install OpenJS.NodeJS",
-                "direct": "Download from: https://nodejs.org/en/download/"
-            },
-            "linux": {
-                "apt": "curl -fsSL https://deb.nodesource.com/setup_lts.x | sudo -E bash -\nsudo apt-get install -y nodejs",
-                "dnf": "sudo dnf install nodejs npm",
-                "yum": "sudo yum install nodejs npm",
-                "pacman": "sudo pacman -S nodejs npm",
-                "zypper": "sudo zypper install nodejs npm",
-                "snap": "sudo snap install node --classic",
-                "direct": "Download from: https://nodejs.org/en/download/"
-            }
+        "linux": {
+            "apt": "wget -qO- https://packages.microsoft.com/keys/microsoft.asc | gpg --dearmor > packages.microsoft.gpg\nsudo install -o root -g root -m 644 packages.microsoft.gpg /etc/apt/trusted.gpg.d/\nsudo sh -c 'echo \"deb [arch=amd64,arm64,armhf signed-by=/etc/apt/trusted.gpg.d/packages.microsoft.gpg] https://packages.microsoft.com/repos/code stable main\" > /etc/apt/sources.list.d/vscode.list'\nsudo apt update && sudo apt install code",
+            "dnf": "sudo rpm --import https://packages.microsoft.com/keys/microsoft.asc\nsudo sh -c 'echo -e \"[code]\\nname=Visual Studio Code\\nbaseurl=https://packages.microsoft.com/yumrepos/vscode\\nenabled=1\\ngpgcheck=1\\ngpgkey=https://packages.microsoft.com/keys/microsoft.asc\" > /etc/yum.repos.d/vscode.repo'\nsudo dnf install code",
+            "snap": "sudo snap install code --classic",
+            "direct": "Download .deb/.rpm from: https://code.visualstudio.com/download"
+        }
+    },
+    "nodejs": {
+        "description": "JavaScript runtime",
+        "windows": {
+            "winget": "winget install OpenJS.NodeJS",
+            "direct": "Download from: https://nodejs.org/en/download/"
         },
-        "chrome": {
-            "description": "Web browser",
-            "windows": {
-                "winget": "winget install Google.Chrome",
-                "direct": "Download from: https://chrome.google.com/"
-            },
-            "linux": {
-                "apt": "wget -q -O - https://dl.google.com/linux/linux_signing_key.pub | sudo apt-key add -\nsudo sh -c 'echo \"deb [arch=amd64] http://dl.google.com/linux/chrome/deb/ stable main\" >> /etc/apt/sources.list.d/google-chrome.list'\nsudo apt update && sudo apt install google-chrome-stable",
-                "dnf": "sudo dnf install fedora-workstation-repositories\nsudo dnf config-manager --set-enabled google-chrome\nsudo dnf install google-chrome-stable",
-                "yum": "sudo yum install google-chrome-stable",
-                "direct": "Download .deb/.rpm from: https://chrome.google.com/"
-            }
+        "linux": {
+            "apt": "curl -fsSL https://deb.nodesource.com/setup_lts.x | sudo -E bash -\nsudo apt-get install -y nodejs",
+            "dnf": "sudo dnf install nodejs npm",
+            "yum": "sudo yum install nodejs npm",
+            "pacman": "sudo pacman -S nodejs npm",
+            "zypper": "sudo zypper install nodejs npm",
+            "snap": "sudo snap install node --classic",
+            "direct": "Download from: https://nodejs.org/en/download/"
+        }
+    },
+    "chrome": {
+        "description": "Web browser",
+        "windows": {
+            "winget": "winget install Google.Chrome",
+            "direct": "Download from: https://chrome.google.com/"
         },
-        "firefox": {
-            "description": "Web browser", 
-            "windows": {
-                "winget": "winget install Mozilla.Firefox",
-                "direct": "Download from: https://firefox.com/"
-            },
-            "linux": {
-                "apt": "sudo apt update && sudo apt install firefox",
-                "dnf": "sudo dnf install firefox",
-                "yum": "sudo yum install firefox",
-                "pacman": "sudo pacman -S firefox",
-                "zypper": "sudo zypper install firefox",
-                "snap": "sudo snap install firefox",
-                "direct": "sudo apt install firefox  # Usually pre-installed on most distros"
-            }
+        "linux": {
+            "apt": "wget -q -O - https://dl.google.com/linux/linux_signing_key.pub | sudo apt-key add -\nsudo sh -c 'echo \"deb [arch=amd64] http://dl.google.com/linux/chrome/deb/ stable main\" >> /etc/apt/sources.list.d/google-chrome.list'\nsudo apt update && sudo apt install google-chrome-stable",
+            "dnf": "sudo dnf install fedora-workstation-repositories\nsudo dnf config-manager --set-enabled google-chrome\nsudo dnf install google-chrome-stable",
+            "yum": "sudo yum install google-chrome-stable",
+            "direct": "Download .deb/.rpm from: https://chrome.google.com/"
+        }
+    },
+    "firefox": {
+        "description": "Web browser", 
+        "windows": {
+            "winget": "winget install Mozilla.Firefox",
+            "direct": "Download from: https://firefox.com/"
         },
-        "discord": {
-            "description": "Communication platform",
-            "windows": {
-                "winget": "winget install Discord.Discord",
-                "direct": "Download from: https://discord.com/download"
-            },
-            "linux": {
-                "apt": "wget -O discord.deb \"https://discordapp.com/api/download?platform=linux&format=deb\"\nsudo dpkg -i discord.deb\nsudo apt-get install -f",
-                "snap": "sudo snap install discord",
-                "direct": "Download .deb/.tar.gz from: https://discord.com/download"
-            }
+        "linux": {
+            "apt": "sudo apt update && sudo apt install firefox",
+            "dnf": "sudo dnf install firefox",
+            "yum": "sudo yum install firefox",
+            "pacman": "sudo pacman -S firefox",
+            "zypper": "sudo zypper install firefox",
+            "snap": "sudo snap install firefox",
+            "direct": "sudo apt install firefox  # Usually pre-installed on most distros"
+        }
+    },
+    "discord": {
+        "description": "Communication platform",
+        "windows": {
+            "winget": "winget install Discord.Discord",
+            "direct": "Download from: https://discord.com/download"
         },
-        "vlc": {
-            "description": "Media player",
-            "windows": {
-                "winget": "winget install VideoLAN.VLC",
-                "direct": "Download from: https://videolan.org/vlc/"
-            },
-            "linux": {
-                "apt": "sudo apt update && sudo apt install vlc",
-                "dnf": "sudo dnf install vlc",
-                "yum": "sudo yum install vlc",
-                "pacman": "sudo pacman -S vlc",
-                "zypper": "sudo zypper install vlc",
-                "snap": "sudo snap install vlc",
-                "direct": "sudo apt install vlc  # Available in most distro repos"
-            }
+        "linux": {
+            "apt": "wget -O discord.deb \"https://discordapp.com/api/download?platform=linux&format=deb\"\nsudo dpkg -i discord.deb\nsudo apt-get install -f",
+            "snap": "sudo snap install discord",
+            "direct": "Download .deb/.tar.gz from: https://discord.com/download"
+        }
+    },
+    "vlc": {
+        "description": "Media player",
+        "windows": {
+            "winget": "winget install VideoLAN.VLC",
+            "direct": "Download from: https://videolan.org/vlc/"
         },
-        "7zip": {
-            "description": "File archiver",
-            "windows": {
-                "winget": "winget install 7zip.7zip",
-                "direct": "Download from: https://7-zip.org/"
-            },
-            "linux": {
-                "apt": "sudo apt update && sudo apt install p7zip-full",
-                "dnf": "sudo dnf install p7zip p7zip-plugins",
-                "yum": "sudo yum install p7zip p7zip-plugins",
-                "pacman": "sudo pacman -S p7zip",
-                "zypper": "sudo zypper install p7zip",
-                "direct": "sudo apt install p7zip-full  # Cross-platform 7zip"
-            }
+        "linux": {
+            "apt": "sudo apt update && sudo apt install vlc",
+            "dnf": "sudo dnf install vlc",
+            "yum": "sudo yum install vlc",
+            "pacman": "sudo pacman -S vlc",
+            "zypper": "sudo zypper install vlc",
+            "snap": "sudo snap install vlc",
+            "direct": "sudo apt install vlc  # Available in most distro repos"
+        }
+    },
+    "7zip": {
+        "description": "File archiver",
+        "windows": {
+            "winget": "winget install 7zip.7zip",
+            "direct": "Download from: https://7-zip.org/"
         },
-        "open-webui": {
-            "description": "Web UI for LLMs",
-            "windows": {
-                "pip": "pip install open-webui\n# Then run with: open-webui serve",
-                "docker": "docker run -d --name open-webui -p 3000:8080 ghcr.io/open-webui/open-webui:main",
-                "direct": "Download from: https://github.com/open-webui/open-webui"
-            },
-            "linux": {
-                "pip": "pip install open-webui\n# Then run with: open-webui serve",
-                "docker": "docker run -d --name open-webui -p 3000:8080 ghcr.io/open-webui/open-webui:main",
-                "direct": "pip install open-webui  # Recommended method"
-            }
+        "linux": {
+            "apt": "sudo apt update && sudo apt install p7zip-full",
+            "dnf": "sudo dnf install p7zip p7zip-plugins",
+            "yum": "sudo yum install p7zip p7zip-plugins",
+            "pacman": "sudo pacman -S p7zip",
+            "zypper": "sudo zypper install p7zip",
+            "direct": "sudo apt install p7zip-full  # Cross-platform 7zip"
+        }
+    },
+    "open-webui": {
+        "description": "Web UI for LLMs",
+        "windows": {
+            "pip": "pip install open-webui\n# Then run with: open-webui serve",
+            "docker": "docker run -d --name open-webui -p 3000:8080 ghcr.io/open-webui/open-webui:main",
+            "direct": "Download from: https://github.com/open-webui/open-webui"
         },
-        "ollama": {
-            "description": "Run LLMs locally",
-            "windows": {
-                "direct": "Download from: https://ollama.ai/download\n# After install: ollama run llama2"
-            },
-            "linux": {
-                "curl": "curl -fsSL https://ollama.ai/install.sh | sh",
-                "direct": "curl -fsSL https://ollama.ai/install.sh | sh\n# After install: ollama run llama2"
-            }
+        "linux": {
+            "pip": "pip install open-webui\n# Then run with: open-webui serve",
+            "docker": "docker run -d --name open-webui -p 3000:8080 ghcr.io/open-webui/open-webui:main",
+            "direct": "pip install open-webui  # Recommended method"
+        }
+    },
+    "ollama": {
+        "description": "Run LLMs locally",
+        "windows": {
+            "direct": "Download from: https://ollama.ai/download\n# After install: ollama run llama2"
+        },
+        "linux": {
+            "curl": "curl -fsSL https://ollama.ai/install.sh | sh",
+            "direct": "curl -fsSL https://ollama.ai/install.sh | sh\n# After install: ollama run llama2"
         }
     }
+})
+
+# First entries of SOFTWARE_DB, listed when a lookup fails
+AVAILABLE_SOFTWARE_TEXT = ', '.join(list(SOFTWARE_DB)[:10])
+
+@lru_cache(maxsize=64)
+def generate_install_commands(software, method="auto"):
+    """Generate installation commands for popular software (cross-platform).
+    Cached - the output only depends on the arguments, the OS and the detected
+    package manager, none of which change while running"""
     
-    # Find software (flexible matching)
-    found_software = None
-    for key in software_db:
-        if software in key or key in software:
-            found_software = key
-            break
+    software = software.lower().strip()
+    method = method.lower().strip()
+    current_os = CURRENT_OS
+    
+    # Find software - exact names are a direct lookup, anything else falls back to flexible matching
+    found_software = software if software in SOFTWARE_DB else None
+    if found_software is None:
+        for key in SOFTWARE_DB:
+            if software in key or key in software:
+                found_software = key
+                break
     
     if not found_software:
         # Generate suggestions for similar software
-        suggestions = [key for key in software_db.keys() if any(word in key for word in software.split())]
+        suggestions = [key for key in SOFTWARE_DB if any(word in key for word in software.split())]
         suggestion_text = f"\nDid you mean: {', '.join(suggestions[:5])}" if suggestions else ""
-        return f"Software '{software}' not found in database.{suggestion_text}\n\nAvailable software: {', '.join(list(software_db.keys())[:10])}..."
+        return f"Software '{software}' not found in database.{suggestion_text}\n\nAvailable software: {AVAILABLE_SOFTWARE_TEXT}..."
     
-    sw = software_db[found_software]
-    os_key = current_os.lower()
+    sw = SOFTWARE_DB[found_software]
+    os_key = CURRENT_OS_KEY
     
     # Get platform-specific commands
     if os_key not in sw:
         return f"Software '{found_software}' is not supported on {current_os}"
     
     platform_commands = sw[os_key]
-    result = f"\n📦 {sw['description']} ({found_software}) - {current_os}\n" + "="*60 + "\n"
+    parts = [f"\n📦 {sw['description']} ({found_software}) - {current_os}\n", "="*60, "\n"]
     
     if method == "auto":
         # Determine best method automatically based on platform
         if current_os == "Windows":
             if "winget" in platform_commands:
-                result += f"🚀 RECOMMENDED (Windows Package Manager):\n{platform_commands['winget']}\n\n"
+                parts.append(f"🚀 RECOMMENDED (Windows Package Manager):\n{platform_commands['winget']}\n\n")
             if "direct" in platform_commands:
-                result += f"🌐 Direct Download:\n{platform_commands['direct']}\n\n"
+                parts.append(f"🌐 Direct Download:\n{platform_commands['direct']}\n\n")
         
         elif current_os == "Linux":
             # Detect package manager and recommend it
             detected_pm = detect_linux_package_manager()
             if detected_pm and detected_pm in platform_commands:
-                result += f"🚀 RECOMMENDED ({detected_pm.upper()}):\n{platform_commands[detected_pm]}\n\n"
+                parts.append(f"🚀 RECOMMENDED ({detected_pm.upper()}):\n{platform_commands[detected_pm]}\n\n")
             
             # Show other available methods
-            for pm_name, command in platform_commands.items():
-                if pm_name != detected_pm and pm_name != "direct":
-                    result += f"📋 {pm_name.upper()}:\n{command}\n\n"
+            parts.extend(
+                f"📋 {pm_name.upper()}:\n{command}\n\n"
+                for pm_name, command in platform_commands.items()
+                if pm_name != detected_pm and pm_name != "direct"
+            )
             
             if "direct" in platform_commands:
-                result += f"🌐 Alternative:\n{platform_commands['direct']}\n\n"
+                parts.append(f"🌐 Alternative:\n{platform_commands['direct']}\n\n")
         
         # Show pip/docker if available
         if "pip" in platform_commands:
-            result += f"🐍 PIP Install:\n{platform_commands['pip']}\n\n"
+            parts.append(f"🐍 PIP Install:\n{platform_commands['pip']}\n\n")
         if "docker" in platform_commands:
-            result += f"🐳 Docker:\n{platform_commands['docker']}\n\n"
+            parts.append(f"🐳 Docker:\n{platform_commands['docker']}\n\n")
     
     elif method in platform_commands:
-        result += f"📋 {method.upper()} Install:\n{platform_commands[method]}\n"
+        parts.append(f"📋 {method.upper()} Install:\n{platform_commands[method]}\n")
     else:
         available = list(platform_commands.keys())
         available.remove("description") if "description" in available else None
-        result += f"Method '{method}' not available for {current_os}.\nAvailable methods: {', '.join(available)}\n"
+        parts.append(f"Method '{method}' not available for {current_os}.\nAvailable methods: {', '.join(available)}\n")
         # Show default method
         if current_os == "Windows" and "winget" in platform_commands:
-            result += f"🚀 Default method:\n{platform_commands['winget']}"
+            parts.append(f"🚀 Default method:\n{platform_commands['winget']}")
         elif current_os == "Linux":
             detected_pm = detect_linux_package_manager()
             if detected_pm in platform_commands:
-                result += f"🚀 Default method:\n{platform_commands[detected_pm]}"
+                parts.append(f"🚀 Default method:\n{platform_commands[detected_pm]}")
     
     if current_os == "Windows":
-        result += "\n💡 TIP: Run commands in PowerShell as Administrator if needed"
+        parts.append("\n💡 TIP: Run commands in PowerShell as Administrator if needed")
     else:
-        result += "\n💡 TIP: You may need sudo privileges for system package installation"
+        parts.append("\n💡 TIP: You may need sudo privileges for system package installation")
     
-    return result
-
+    return "".join(parts)
+
+# File action patterns (contextual)
+FILE_ACTION_PATTERNS = [
+    # Direct commands
+    r'\b(?:create|make|generate|build)\s+.*?\b(?:file|folder|directory)\b',
+    r'\b(?:save|write|store|put)\s+.*?\b(?:to|in|into)\s+.*?\b(?:workspace|folder|directory)\b',
+    r'\b(?:read|open|view|show|display)\s+.*?\b(?:file|document)\b',
+    
+    # Search and find operations
+    r'\b(?:find|search|list|show)\s+.*?\b(?:files?|folders?|directories?)\b',
+    r'\b(?:find|search)\s+.*?\b(?:in|within)\s+.*?\b(?:workspace|folder|directory)\b',
+    
+    # Conversational requests  
+    r'\b(?:can you|could you|please)\s+.*?(?:create|save|make|generate|find|search)\b',
+    r'(?:i need|i want|i would like)\s+.*?\b(?:file|folder|document)\b',
+    
+    # Workspace references
+    r'\b(?:workspace|project|repository)\s+(?:folder|directory)\b',
+    
+    # File naming and renaming context
+    r'\b(?:call it|name it|rename)\s+.*?\b(?:different|another|new)\b',  # "call it different name"
+    r'\b(?:save.*?as|export.*?as)\b',
+    
+    # File operation context
+    r'\b(?:overwrite|replace|update)\s+.*?\b(?:file|document)\b'
+]
+
+# Exclude conversational questions (stronger patterns)
+EXCLUSION_PATTERNS = [
+    r'\b(?:what is|what are|what\'s|how do|how does|explain|describe|tell me about|why)\b',
+    r'\b(?:difference between|compare|versus|vs\.)\b',  # Comparison questions
+    r'\b(?:i read|i saw|i heard|reading about)\b',
+    r'\b(?:book|article|story|tutorial)\b',
+    r'\b(?:have you|did you)\s+(?:created|made|saved|written|finished)\b',  # "have you created"
+    r'\b(?:where is|can i see|do you see)\b',  # Location/visibility questions
+    r'\b(?:learn|understand|know|help me understand)\b'  # Learning/educational context
+]
+
+# Each pattern list is joined into one compiled alternation so a single scan
+# of the prompt answers "did any of these match"
+FILE_ACTION_REGEX = re.compile('|'.join(f'(?:{pattern})' for pattern in FILE_ACTION_PATTERNS))
+EXCLUSION_REGEX = re.compile('|'.join(f'(?:{pattern})' for pattern in EXCLUSION_PATTERNS))
+
+# File extension mentions - kept out of the alternation above so it only runs
+# when the prompt actually contains a '.'
+FILE_EXTENSION_REGEX = re.compile(r'\.(?:md|txt|json|csv|py|js|html|css)\b')
+
+# Fallback keyword detection - a prompt needs both a keyword and an action word
+INTENT_KEYWORDS = (
+    'file', 'folder', 'directory', 'create', 'make', 'generate', 'build',
+    'save', 'write', 'edit', 'copy', 'move', 'list', 'search', 'find',
+    'compress', 'backup', 'json', 'txt', 'md', 'workspace', 'put', 'store'
+)
+INTENT_ACTION_WORDS = (
+    'create', 'make', 'save', 'write', 'generate', 'build', 'put',
+    'find', 'search', 'list', 'show', 'delete', 'remove'
+)
+
+# Keywords match anywhere in the prompt (so 'files' and 'created' still count);
+# each alternation finds any of its words in a single scan
+INTENT_KEYWORD_REGEX = re.compile('|'.join(re.escape(keyword) for keyword in INTENT_KEYWORDS))
+INTENT_ACTION_REGEX = re.compile('|'.join(re.escape(word) for word in INTENT_ACTION_WORDS))
+
+# No prompt shorter than the shortest action word can trigger tools (the
+# shortest extension match, e.g. '.md', is the same length)
+MIN_INTENT_PROMPT_LENGTH = min(len(word) for word in INTENT_ACTION_WORDS)
+
+@lru_cache(maxsize=128)
 def detect_file_intent(prompt: str) -> bool:
-    """Enhanced contextual detection for file operations"""
+    """Enhanced contextual detection for file operations (pure, so repeated prompts are cached)"""
     prompt_lower = prompt.lower()
     
-    # File action patterns (contextual)
-    file_action_patterns = [
-        # Direct commands
-        r'\b(create|make|generate|build)\s+.*\b(file|folder|directory)\b',
-        r'\b(save|write|store|put)\s+.*\b(to|in|into)\s+.*\b(workspace|folder|directory)\b',
-        r'\b(read|open|view|show|display)\s+.*\b(file|document)\b',
-        
-        # Search and find operations
-        r'\b(find|search|list|show)\s+.*\b(files?|folders?|directories?)\b',
-        r'\b(find|search)\s+.*\b(in|within)\s+.*\b(workspace|folder|directory)\b',
-        
-        # Conversational requests  
-        r'\b(can you|could you|please)\s+.*(create|save|make|generate|find|search)\b',
-        r'(i need|i want|i would like)\s+.*\b(file|folder|document)\b',
-        
-        # File extensions and workspace references
-        r'\.(md|txt|json|csv|py|js|html|css)\b',
-        r'\b(workspace|project|repository)\s+(folder|directory)\b',
-        
-        # File naming and renaming context
-        r'\b(call it|name it|rename)\s+.*\b(different|another|new)\b',  # "call it different name"
-        r'\b(save.*as|export.*as)\b',
-        
-        # File operation context
-        r'\b(overwrite|replace|update)\s+.*\b(file|document)\b'
-    ]
-    
-    # Exclude conversational questions (stronger patterns)
-    exclusion_patterns = [
-        r'\b(what is|what are|what\'s|how do|how does|explain|describe|tell me about|why)\b',
-        r'\b(difference between|compare|versus|vs\.)\b',  # Comparison questions
-        r'\b(i read|i saw|i heard|reading about)\b',
-        r'\b(book|article|story|tutorial)\b',
-        r'\b(have you|did you)\s+(created|made|saved|written|finished)\b',  # "have you created"
-        r'\b(where is|can i see|do you see)\b',  # Location/visibility questions
-        r'\b(learn|understand|know|help me understand)\b'  # Learning/educational context
-    ]
+    # Empty and very short prompts cannot match any pattern or keyword
+    if len(prompt_lower) < MIN_INTENT_PROMPT_LENGTH:
+        return False
     
     # Check exclusions first (status questions should not trigger tools)
-    if any(re.search(pattern, prompt_lower) for pattern in exclusion_patterns):
+    if EXCLUSION_REGEX.search(prompt_lower):
         return False
     
     # Special case: "call it a different name" should trigger tools
@@ -1695,21 +1945,61 @@ def detect_file_intent(prompt: str) -> bool:
         return True
     
     # Check for file action patterns
-    if any(re.search(pattern, prompt_lower) for pattern in file_action_patterns):
+    if FILE_ACTION_REGEX.search(prompt_lower):
+        return True
+    if '.' in prompt_lower and FILE_EXTENSION_REGEX.search(prompt_lower):
         return True
     
     # Fallback to enhanced keyword detection with context awareness
-    enhanced_keywords = [
-        'file', 'folder', 'directory', 'create', 'make', 'generate', 'build',
-        'save', 'write', 'edit', 'copy', 'move', 'list', 'search', 'find',
-        'compress', 'backup', 'json', 'txt', 'md', 'workspace', 'put', 'store'
-    ]
-    
-    # Only trigger on keywords if there's action context
-    has_keywords = any(keyword in prompt_lower for keyword in enhanced_keywords)
-    has_action_words = any(word in prompt_lower for word in ['create', 'make', 'save', 'write', 'generate', 'build', 'put', 'find', 'search', 'list', 'show', 'delete', 'remove'])
-    
-    return has_keywords and has_action_words
+    # Only trigger on keywords if there's action context - the action check runs
+    # first so prompts without one skip the keyword scan entirely
+    if INTENT_ACTION_REGEX.search(prompt_lower) is None:
+        return False
+    return INTENT_KEYWORD_REGEX.search(prompt_lower) is not None
+
+# /tools overview, joined once so it prints with a single write
+TOOLS_HELP_TEXT = "\n".join([
+    "\nAvailable File Management Tools:",
+    "- create file...",
+    "- read file...",
+    "- write to file...",
+    "- delete file...",
+    "- copy file...",
+    "- move file...",
+    "- get file info...",
+    "- list files...",
+    "- search files...",
+    "- compress files...",
+    "- create folder...",
+    "- copy folder...",
+    "- delete folder...",
+    "- write .json...",
+    "- write .txt...",
+    "- write .md...",
+    "\nUse 'tools: <command>' to force the use of that tool",
+])
+
+def show_tools_help():
+    """Print the /tools overview of available file management tools"""
+    print(TOOLS_HELP_TEXT)
+
+def show_memory_status():
+    """Print the /memory status summary"""
+    print(f"Memory Status:")
+    print(f"  Current: {len(memory.current_conversation)} messages")
+    print(f"  Recent: {len(memory.recent_conversations)} full conversations")
+    print(f"  Summarized: {len(memory.summarized_conversations)} conversations")
+    logger.info("Memory status displayed")
+
+def reset_all_memory():
+    """Clear all memory for /reset"""
+    memory.reset_memory()
+    memory.save_memory()
+    print("Memory cleared")
+    logger.info("Memory reset by user")
+
+# Commands that end the interactive session
+EXIT_COMMANDS = frozenset({'exit', 'quit', 'q'})
 
 def interactive_mode():
     """Interactive chat mode with rolling memory"""
@@ -1721,7 +2011,7 @@ def interactive_mode():
     print("Workspace: \\WorkspaceAI\\workspace")
     
     # Show detected package manager on Linux
-    if platform.system() == "Linux":
+    if CURRENT_OS == "Linux":
         detected_pm = detect_linux_package_manager()
         print(f"Package manager: {detected_pm if detected_pm else 'Not detected'}")
 
@@ -1741,10 +2031,20 @@ def interactive_mode():
     print("="*70)
     print("Ready for your input...")
 
+    # Slash commands dispatch through one lookup instead of an if/elif chain
+    slash_commands = {
+        '/new': memory.start_new_conversation,
+        '/tools': show_tools_help,
+        '/memory': show_memory_status,
+        '/config': configure_settings,
+        '/reset': reset_all_memory,
+    }
+
     while True:
         try:
             prompt = input(f"\nYou: ").strip()
-            if prompt.lower() in ['exit', 'quit', 'q']:
+            prompt_lower = prompt.lower()
+            if prompt_lower in EXIT_COMMANDS:
                 print("Exiting WorkspaceAI.")
                 logger.info("User exited application")
                 # Move current conversation to recent before exiting
@@ -1753,49 +2053,17 @@ def interactive_mode():
                 else:
                     memory.save_memory()
                 break
-            elif prompt == '/new':
-                memory.start_new_conversation()
-            elif prompt == '/tools':
-                print("\nAvailable File Management Tools:")
-                print("- create file...")
-                print("- read file...")
-                print("- write to file...")
-                print("- delete file...")
-                print("- copy file...")
-                print("- move file...")
-                print("- get file info...")
-                print("- list files...")
-                print("- search files...")
-                print("- compress files...")
-                print("- create folder...")
-                print("- copy folder...")
-                print("- delete folder...")
-                print("- write .json...")
-                print("- write .txt...")
-                print("- write .md...")
-                print("\nUse 'tools: <command>' to force the use of that tool")
-            elif prompt == '/memory':
-                print(f"Memory Status:")
-                print(f"  Current: {len(memory.current_conversation)} messages")
-                print(f"  Recent: {len(memory.recent_conversations)} full conversations")
-                print(f"  Summarized: {len(memory.summarized_conversations)} conversations")
-                logger.info("Memory status displayed")
-            elif prompt == '/config':
-                configure_settings()
-            elif prompt == '/reset':
-                memory.reset_memory()
-                memory.save_memory()
-                print("Memory cleared")
-                logger.info("Memory reset by user")
+            elif prompt in slash_commands:
+                slash_commands[prompt]()
             elif not prompt:
                 continue
-            elif prompt.lower().startswith('chat:'):
+            elif prompt_lower.startswith('chat:'):
                 actual_prompt = prompt[5:].strip()
                 if actual_prompt:
                     call_ollama_with_tools(actual_prompt, use_tools=False)
                 else:
                     print("Please provide a question after 'chat:'")
-            elif prompt.lower().startswith('tools:'):
+            elif prompt_lower.startswith('tools:'):
                 actual_prompt = prompt[6:].strip()
                 if actual_prompt:
                     call_ollama_with_tools(actual_prompt, use_tools=True)
@@ -1804,7 +2072,7 @@ def interactive_mode():
             else:
                 # Enhanced tool detection with logging
                 looks_like_file_task = detect_file_intent(prompt)
-                logger.info(f"Tool detection: '{prompt[:50]}...' -> use_tools={looks_like_file_task}")
+                logger.info("Tool detection: '%s...' -> use_tools=%s", prompt[:50], looks_like_file_task)
                 call_ollama_with_tools(prompt, use_tools=looks_like_file_task)
                 
         except KeyboardInterrupt:
@@ -1826,7 +2094,7 @@ def interactive_mode():
                 memory.save_memory()
             break
         except Exception as e:
-            logger.error(f"Unexpected error in interactive loop: {e}")
+            logger.error("Unexpected error in interactive loop: %s", e)
             print(f"⚠️ An error occurred: {e}")
             print("You can continue or type 'exit' to quit.")
 
@@ -1835,7 +2103,7 @@ def test_ollama_connection():
     try:
         logger.info("Testing Ollama connection...")
         host = APP_CONFIG['settings']['ollama_host']
-        response = requests.get(f"http://{host}/api/tags", timeout=CONSTANTS['SUMMARY_TIMEOUT'])
+        response = OLLAMA_SESSION.get(f"http://{host}/api/tags", timeout=CONSTANTS['SUMMARY_TIMEOUT'])
         
         if response.status_code == 200:
             models = response.json().get('models', [])
@@ -1843,7 +2111,7 @@ def test_ollama_connection():
             
             if qwen_models:
                 print(f"✅ Ollama connected! Available Qwen models: {', '.join(qwen_models)}")
-                logger.info(f"Ollama connection successful. Qwen models: {qwen_models}")
+                logger.info("Ollama connection successful. Qwen models: %s", qwen_models)
                 return True
             else:
                 print("⚠️  Ollama connected but no Qwen models found!")
@@ -1851,7 +2119,7 @@ def test_ollama_connection():
                 logger.warning("No Qwen models found in Ollama")
                 return False
         else:
-            logger.error(f"Ollama returned status {response.status_code}: {response.text}")
+            logger.error("Ollama returned status %s: %s", response.status_code, response.text)
             print(f"❌ Ollama error: {response.status_code}")
             return False
             
@@ -1868,12 +2136,12 @@ def test_ollama_connection():
         return False
         
     except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON response from Ollama: {e}")
+        logger.error("Invalid JSON response from Ollama: %s", e)
         print("❌ Invalid response from Ollama")
         return False
         
     except Exception as e:
-        logger.error(f"Unexpected error testing Ollama connection: {e}")
+        logger.error("Unexpected error testing Ollama connection: %s", e)
         print(f"❌ Ollama connection failed: {e}")
         print("💡 Make sure Ollama is running: ollama serve")
         return False
@@ -1939,8 +2207,6 @@ def configure_settings():
 
 def main():
     """Setup and start enhanced interactive mode"""
-    global file_manager, memory, logger
-    
     print("Initializing WorkspaceAI...")
     
     # Ensure config is saved if this is first run
@@ -1948,14 +2214,9 @@ def main():
         save_config(APP_CONFIG)
         print("Created default configuration")
     
-    # Reconfigure logging with proper location
-    logger = setup_logging()
+    # Logging, file manager and memory manager are already set up at import
     logger.info("WorkspaceAI starting up")
     
-    # Initialize managers
-    file_manager = FileManager()
-    # Use global memory manager instead of creating a new one
-    
     # Test Ollama connection
     if not test_ollama_connection():
         input("\nPress Enter to continue anyway or Ctrl+C to exit...")